@@ -235,7 +235,9 @@ class AID(object):
             # Refresh this agent
             self.agent = self.manager.get(aim_ctx, self.agent)
             if not self.single_aid:
-                down_time = self.agent.down_time(aim_ctx)
+                # Evaluate every agent against the same DB timestamp
+                current = aim_ctx.store.current_timestamp
+                down_time = self.agent.down_time(aim_ctx, current=current)
                 if max(0, down_time or 0) > self.max_down_time:
                     utils.perform_harakiri(LOG, "Agent has been down for %s "
                                                 "seconds." % down_time)
@@ -243,7 +245,7 @@ class AID(object):
                 agents = [
                     x for x in self.manager.find(aim_ctx, resource.Agent,
                                                  admin_state_up=True)
-                    if not x.is_down(aim_ctx)]
+                    if not x.is_down(aim_ctx, current=current)]
                 # Validate agent version
                 if not agents:
                     return []
@@ -95,7 +95,7 @@ def default_to_resource(converted, helper, to_aim=True):
         return klass(
             _set_default=False,
             **dict([(k, v) for k, v in converted.items() if k in
-                    klass.attributes() and k not in skip]))
+                    klass._attribute_set and k not in skip]))
     else:
         for s in default_skip + skip:
             converted.pop(s, None)
@@ -282,8 +282,8 @@ class AimManager(object):
         """
         self._validate_resource_class(resource_class)
         attr_val = {k: v for k, v in kwargs.items()
-                    if k in resource_class.attributes() +
-                    ['in_', 'notin_', 'order_by']}
+                    if k in resource_class._attribute_set or
+                    k in ('in_', 'notin_', 'order_by')}
         return self._delete_db(context.store, resource_class, **attr_val)
 
     def get(self, context, resource, for_update=False, include_aim_id=False):
@@ -327,8 +327,8 @@ class AimManager(object):
         """
         self._validate_resource_class(resource_class)
         attr_val = {k: v for k, v in kwargs.items()
-                    if k in resource_class.attributes() +
-                    ['in_', 'notin_', 'order_by']}
+                    if k in resource_class._attribute_set or
+                    k in ('in_', 'notin_', 'order_by')}
         result = []
         for obj in self._query_db(context.store, resource_class,
                                   for_update=for_update, **attr_val):
@@ -340,8 +340,8 @@ class AimManager(object):
     def count(self, context, resource_class, **kwargs):
         self._validate_resource_class(resource_class)
         attr_val = {k: v for k, v in kwargs.items()
-                    if k in resource_class.attributes() +
-                    ['in_', 'notin_', 'order_by']}
+                    if k in resource_class._attribute_set or
+                    k in ('in_', 'notin_', 'order_by')}
         return self._count_db(context.store, resource_class, **attr_val)
 
     def get_status(self, context, resource, for_update=False,
@@ -127,7 +127,7 @@ class AimStore(object):
 
     def make_resource(self, cls, db_obj, include_aim_id=False):
         attr_val = {k: v for k, v in self.to_attr(cls, db_obj).items()
-                    if k in cls.attributes()}
+                    if k in cls._attribute_set}
         res = cls(**attr_val)
         if include_aim_id and hasattr(db_obj, 'aim_id'):
             res._aim_id = db_obj.aim_id
@@ -13,11 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import base64
 import datetime
-from hashlib import md5
-import oslo_serialization
+import operator
 import six
+from six.moves import intern
 
 from oslo_config import cfg
 from oslo_log import log as logging
@@ -31,8 +30,56 @@ from apicapi import apic_client
 
 
 LOG = logging.getLogger(__name__)
+# DNManager holds no state, a single instance serves every DN lookup
+_DN_MANAGER = apic_client.DNManager()
 
 
+def _interned(names):
+    return tuple(intern(x) for x in names)
+
+
+def _tuple_getter(names):
+    # attrgetter returns a bare value for a single name and can't be built
+    # without any, so normalize it to always return a tuple.
+    if len(names) > 1:
+        return operator.attrgetter(*names)
+    if names:
+        getter = operator.attrgetter(names[0])
+        return lambda obj: (getter(obj),)
+    return lambda obj: ()
+
+
+class _ResourceMeta(type):
+    """Metaclass caching the attribute names of every resource class.
+
+    The attribute schema of a resource never changes after the class is
+    defined, so the name tuples used in the hot paths (identity, members,
+    attributes, ...) are computed only once here.
+    """
+
+    def __init__(cls, name, bases, attrs):
+        super(_ResourceMeta, cls).__init__(name, bases, attrs)
+        cls._identity_names = _interned(
+            getattr(cls, 'identity_attributes', ()))
+        cls._other_names = _interned(getattr(cls, 'other_attributes', ()))
+        cls._has_display_name = 'display_name' in cls._other_names
+        cls._str_prefix = name + '('
+        cls._list_defaults = tuple(k for k, v in cls._defaults.items()
+                                   if isinstance(v, list))
+        cls._db_names = (_interned(cls.db_attributes) +
+                         _interned(cls.common_db_attributes))
+        if '_aci_mo_name' in attrs:
+            cls._aci_mo_name = intern(attrs['_aci_mo_name'])
+        cls._identity_getter = staticmethod(
+            _tuple_getter(cls._identity_names))
+        cls._user_names = cls._identity_names + cls._other_names
+        cls._attribute_names = cls._user_names + cls._db_names
+        cls._attribute_set = frozenset(cls._attribute_names)
+        cls._members_names = cls._attribute_names + (
+            'pre_existing', '_error', '_pending')
+
+
+@six.add_metaclass(_ResourceMeta)
 class ResourceBase(object):
     """Base class for AIM resource.
 
@@ -46,73 +93,69 @@ class ResourceBase(object):
     that are managed by the database layer, eg: timestamp, incremental counter.
     """
 
+    # Resources deliberately keep a per-instance __dict__ rather than
+    # declaring __slots__: converters, the REST server and the tests attach
+    # private attributes (_status, _aim_id, _parent_class, ...) and read or
+    # update resource state through __dict__ directly.
+
     db_attributes = t.db()
     common_db_attributes = t.db(('epoch', t.epoch))
     sorted_attributes = []
+    # Class level template of default values that subclasses may pass to
+    # __init__ instead of building a new dict on every construction.
+    _defaults = {}
+    # Resources not loaded from the DB have no epoch yet. A class level
+    # default keeps failed attribute lookups off a Python __getattr__ hook.
+    epoch = None
 
     def __init__(self, defaults, **kwargs):
-        unset_attr = [k for k in self.identity_attributes
-                      if kwargs.get(k) is None and k not in defaults]
-        if 'display_name' in self.other_attributes:
-            defaults.setdefault('display_name', '')
+        # Identity attributes are nearly always given, so only build the
+        # list of missing ones when one is actually found.
+        unset_attr = None
+        for k in self._identity_names:
+            if kwargs.get(k) is None and k not in defaults:
+                unset_attr = unset_attr or []
+                unset_attr.append(k)
         if unset_attr:
             raise exc.IdentityAttributesMissing(klass=type(self).__name__,
                                                 attr=unset_attr)
+        # Merge defaults and explicit values once, so that keys given in
+        # kwargs are not written twice, and store them in a single update.
         if kwargs.pop('_set_default', True):
-            for k, v in defaults.items():
-                setattr(self, k, v)
-        for k, v in kwargs.items():
-            setattr(self, k, v)
-
-    def __getattr__(self, item):
-        if item == 'epoch':
-            return None
-        super(ResourceBase, self).__getattr__(item)
+            values = dict(defaults)
+            if self._has_display_name:
+                values.setdefault('display_name', '')
+            values.update(kwargs)
+            # The class level template is shared by every instance, so its
+            # list values are copied, unless kwargs replaces them anyway.
+            if defaults is self._defaults:
+                for k in self._list_defaults:
+                    if k not in kwargs:
+                        values[k] = list(defaults[k])
+        else:
+            values = kwargs
+        self.__dict__.update(values)
 
     @property
     def identity(self):
-        return [str(getattr(self, x)) for x in self.identity_attributes.keys()]
+        return [str(x) for x in self._identity_getter(self)]
 
     @classmethod
     def attributes(cls):
-        return (list(cls.identity_attributes.keys()) +
-                list(cls.other_attributes.keys()) +
-                list(cls.db_attributes.keys()) +
-                list(cls.common_db_attributes.keys()))
+        return list(cls._attribute_names)
 
     @classmethod
     def user_attributes(cls):
-        return list(cls.identity_attributes.keys()) + list(
-            cls.other_attributes.keys())
+        return list(cls._user_names)
 
     @classmethod
     def non_user_attributes(cls):
-        return list(cls.db_attributes.keys()) + list(
-            cls.common_db_attributes.keys())
+        return list(cls._db_names)
 
     @property
     def members(self):
-        return {x: self.__dict__[x] for x in self.attributes() +
-                ['pe_existing', '_error', '_pending'] if x in self.__dict__}
-
-    @property
-    def hash(self):
-        def make_serializable(key, attr):
-            if isinstance(attr, list) and key not in self.sorted_attributes:
-                return sorted(make_serializable(None, x) for x in attr)
-            if isinstance(attr, dict):
-                return sorted([(k, make_serializable(k, v))
-                               for k, v in attr.items()])
-            if isinstance(attr, set):
-                return sorted([(make_serializable(None, x) for x in attr)])
-            if isinstance(attr, (int, float, bool, type(None))):
-                return attr
-            # Don't know the type, make it serializable anyways
-            return str(attr)
-        serializable = make_serializable(None, self.members)
-        return int(md5(base64.b64encode(
-            oslo_serialization.jsonutils.dump_as_bytes(
-                serializable, sort_keys=True))).hexdigest(), 16)
+        values = self.__dict__
+        return {x: values[x] for x in self._members_names if x in values}
 
     def user_equal(self, other):
         def sort_if_list(key, attr):
@@ -140,10 +183,17 @@ class ResourceBase(object):
         return True
 
     def __str__(self):
-        return '%s(%s)' % (type(self).__name__, ','.join(self.identity))
+        return self._str_prefix + ','.join(self.identity) + ')'
 
     def __eq__(self, other):
-        return self.__dict__ == other.__dict__
+        # Comparing the instance dicts first keeps unequal resources, the
+        # common case when diffing, on a single C level comparison. The
+        # type only needs checking once the dicts match.
+        try:
+            return (self.__dict__ == other.__dict__ and
+                    type(self) is type(other))
+        except AttributeError:
+            return False
 
     def __ne__(self, other):
         return not self.__eq__(other)
@@ -160,8 +210,11 @@ class ResourceBase(object):
     # address of the object in memory) goes away.
     # So for each class defining __eq__() we must also
     # define __hash__() even though parent class has __hash__().
+    #
+    # Resources that compare equal always share type and identity, so
+    # hashing those is enough and avoids serializing every member.
     def __hash__(self):
-        return self.hash
+        return hash((type(self),) + tuple(self._identity_getter(self)))
 
 
 class AciResourceBase(ResourceBase):
@@ -181,14 +234,23 @@ class AciResourceBase(ResourceBase):
                 raise exc.AciResourceDefinitionError(attr=ra, klass=cls)
         super(AciResourceBase, self).__init__(defaults, **kwargs)
 
+    @classmethod
+    def _get_mo_class(cls):
+        # The ManagedObjectClass only depends on _aci_mo_name, so build it
+        # once per resource class rather than on every dn/rn access.
+        mo = cls.__dict__.get('_mo_class')
+        if mo is None:
+            mo = apic_client.ManagedObjectClass(cls._aci_mo_name)
+            cls._mo_class = mo
+        return mo
+
     @property
     def dn(self):
-        return apic_client.ManagedObjectClass(self._aci_mo_name).dn(
-            *self.identity)
+        return self._get_mo_class().dn(*self.identity)
 
     @property
     def rn(self):
-        mo = apic_client.ManagedObjectClass(self._aci_mo_name)
+        mo = self._get_mo_class()
         if mo.rn_param_count > 0:
             return mo.rn(*self.identity[-mo.rn_param_count:])
         else:
@@ -196,14 +258,13 @@ class AciResourceBase(ResourceBase):
 
     @classmethod
     def from_dn(cls, dn):
-        dn_mgr = apic_client.DNManager()
         try:
-            mos_and_rns = dn_mgr.aci_decompose_with_type(dn, cls._aci_mo_name)
-            rns = dn_mgr.filter_rns(mos_and_rns)
-            if len(rns) < len(cls.identity_attributes):
+            mos_and_rns = _DN_MANAGER.aci_decompose_with_type(
+                dn, cls._aci_mo_name)
+            rns = _DN_MANAGER.filter_rns(mos_and_rns)
+            if len(rns) < len(cls._identity_names):
                 raise exc.InvalidDNForAciResource(dn=dn, cls=cls)
-            attr = {p[0]: p[1] for p in zip(cls.identity_attributes, rns)}
-            return cls(**attr)
+            return cls(**dict(zip(cls._identity_names, rns)))
         except apic_client.DNManager.InvalidNameFormat:
             raise exc.InvalidDNForAciResource(dn=dn, cls=cls)
 
@@ -218,7 +279,7 @@ class AciResourceBase(ResourceBase):
 
     @classmethod
     def root_ref_attribute(cls):
-        return list(cls.identity_attributes.keys())[0]
+        return cls._identity_names[0]
 
 
 class AciRoot(AciResourceBase):
@@ -315,17 +376,18 @@ class BridgeDomain(AciResourceBase):
     _aci_mo_name = 'fvBD'
     _tree_parent = Tenant
 
+    _defaults = {'vrf_name': '',
+                 'enable_arp_flood': True,
+                 'enable_routing': True,
+                 'limit_ip_learn_to_subnets': False,
+                 'ip_learning': True,
+                 'l2_unknown_unicast_mode': 'proxy',
+                 'ep_move_detect_mode': 'garp',
+                 'l3out_names': [],
+                 'monitored': False}
+
     def __init__(self, **kwargs):
-        super(BridgeDomain, self).__init__({'vrf_name': '',
-                                            'enable_arp_flood': True,
-                                            'enable_routing': True,
-                                            'limit_ip_learn_to_subnets': False,
-                                            'ip_learning': True,
-                                            'l2_unknown_unicast_mode': 'proxy',
-                                            'ep_move_detect_mode': 'garp',
-                                            'l3out_names': [],
-                                            'monitored': False},
-                                           **kwargs)
+        super(BridgeDomain, self).__init__(self._defaults, **kwargs)
 
 
 class Agent(ResourceBase):
@@ -344,8 +406,11 @@ class Agent(ResourceBase):
     db_attributes = t.db(('heartbeat_timestamp', t.string()))
 
     def __init__(self, **kwargs):
-        super(Agent, self).__init__({'admin_state_up': True,
-                                     'id': utils.generate_uuid()}, **kwargs)
+        defaults = {'admin_state_up': True}
+        # Agents read back from the DB already carry their id
+        if kwargs.get('id') is None:
+            defaults['id'] = utils.generate_uuid()
+        super(Agent, self).__init__(defaults, **kwargs)
 
     def __eq__(self, other):
         return self.id == other.id
@@ -362,8 +427,11 @@ class Agent(ResourceBase):
     def __hash__(self):
         return super(Agent, self).__hash__()
 
-    def is_down(self, context):
-        current = context.store.current_timestamp
+    def is_down(self, context, current=None):
+        # Callers checking several agents at once can fetch the store
+        # timestamp once and pass it in, saving a DB round trip per agent.
+        if current is None:
+            current = context.store.current_timestamp
         # When the store doesn't support timestamps the agent can never
         # be considered down.
         if current is None:
@@ -371,16 +439,17 @@ class Agent(ResourceBase):
         result = current - self.heartbeat_timestamp >= datetime.timedelta(
             seconds=cfg.CONF.aim.agent_down_time)
         if result:
-            LOG.warn("Agent %s is down. Last heartbeat was %s" %
-                     (self.id, self.heartbeat_timestamp))
+            LOG.warn("Agent %s is down. Last heartbeat was %s",
+                     self.id, self.heartbeat_timestamp)
         else:
-            LOG.debug("Agent %s is alive, its last heartbeat was %s" %
-                      (self.id, self.heartbeat_timestamp))
+            LOG.debug("Agent %s is alive, its last heartbeat was %s",
+                      self.id, self.heartbeat_timestamp)
         return result
 
-    def down_time(self, context):
-        if self.is_down(context):
+    def down_time(self, context, current=None):
+        if current is None:
             current = context.store.current_timestamp
+        if self.is_down(context, current=current):
             return (current - self.heartbeat_timestamp).seconds
 
 
@@ -505,22 +574,22 @@ class EndpointGroup(AciResourceBase):
     POLICY_UNENFORCED = 'unenforced'
     POLICY_ENFORCED = 'enforced'
 
+    _defaults = {'bd_name': '',
+                 'provided_contract_names': [],
+                 'consumed_contract_names': [],
+                 'openstack_vmm_domain_names': [],
+                 'physical_domain_names': [],
+                 'vmm_domains': [],
+                 'physical_domains': [],
+                 'policy_enforcement_pref': POLICY_UNENFORCED,
+                 'static_paths': [],
+                 'epg_contract_masters': [],
+                 'qos_name': '',
+                 'monitored': False,
+                 'sync': True}
+
     def __init__(self, **kwargs):
-        super(EndpointGroup, self).__init__({'bd_name': '',
-                                             'provided_contract_names': [],
-                                             'consumed_contract_names': [],
-                                             'openstack_vmm_domain_names': [],
-                                             'physical_domain_names': [],
-                                             'vmm_domains': [],
-                                             'physical_domains': [],
-                                             'policy_enforcement_pref':
-                                             self.POLICY_UNENFORCED,
-                                             'static_paths': [],
-                                             'epg_contract_masters': [],
-                                             'qos_name': '',
-                                             'monitored': False,
-                                             'sync': True},
-                                            **kwargs)
+        super(EndpointGroup, self).__init__(self._defaults, **kwargs)
 
 
 class Filter(AciResourceBase):
@@ -592,22 +661,22 @@ class FilterEntry(AciResourceBase):
     _aci_mo_name = 'vzEntry'
     _tree_parent = Filter
 
+    _defaults = {'arp_opcode': t.UNSPECIFIED,
+                 'ether_type': t.UNSPECIFIED,
+                 'ip_protocol': t.UNSPECIFIED,
+                 'icmpv4_type': t.UNSPECIFIED,
+                 'icmpv6_type': t.UNSPECIFIED,
+                 'source_from_port': t.UNSPECIFIED,
+                 'source_to_port': t.UNSPECIFIED,
+                 'dest_from_port': t.UNSPECIFIED,
+                 'dest_to_port': t.UNSPECIFIED,
+                 'tcp_flags': t.UNSPECIFIED,
+                 'stateful': False,
+                 'fragment_only': False,
+                 'monitored': False}
+
     def __init__(self, **kwargs):
-        super(FilterEntry, self).__init__(
-            {'arp_opcode': self.UNSPECIFIED,
-             'ether_type': self.UNSPECIFIED,
-             'ip_protocol': self.UNSPECIFIED,
-             'icmpv4_type': self.UNSPECIFIED,
-             'icmpv6_type': self.UNSPECIFIED,
-             'source_from_port': self.UNSPECIFIED,
-             'source_to_port': self.UNSPECIFIED,
-             'dest_from_port': self.UNSPECIFIED,
-             'dest_to_port': self.UNSPECIFIED,
-             'tcp_flags': self.UNSPECIFIED,
-             'stateful': False,
-             'fragment_only': False,
-             'monitored': False},
-            **kwargs)
+        super(FilterEntry, self).__init__(self._defaults, **kwargs)
 
 
 class Contract(AciResourceBase):
@@ -662,13 +731,16 @@ class ContractSubject(AciResourceBase):
     _aci_mo_name = 'vzSubj'
     _tree_parent = Contract
 
+    _defaults = {'in_filters': [],
+                 'out_filters': [],
+                 'bi_filters': [],
+                 'service_graph_name': '',
+                 'in_service_graph_name': '',
+                 'out_service_graph_name': '',
+                 'monitored': False}
+
     def __init__(self, **kwargs):
-        super(ContractSubject, self).__init__(
-            {'in_filters': [], 'out_filters': [], 'bi_filters': [],
-             'service_graph_name': '',
-             'in_service_graph_name': '',
-             'out_service_graph_name': '',
-             'monitored': False}, **kwargs)
+        super(ContractSubject, self).__init__(self._defaults, **kwargs)
 
 
 class OutOfBandContract(AciResourceBase):
@@ -723,13 +795,17 @@ class OutOfBandContractSubject(AciResourceBase):
     _aci_mo_name = 'vzSubj__tn'
     _tree_parent = OutOfBandContract
 
+    _defaults = {'in_filters': [],
+                 'out_filters': [],
+                 'bi_filters': [],
+                 'service_graph_name': '',
+                 'in_service_graph_name': '',
+                 'out_service_graph_name': '',
+                 'monitored': False}
+
     def __init__(self, **kwargs):
         super(OutOfBandContractSubject, self).__init__(
-            {'in_filters': [], 'out_filters': [], 'bi_filters': [],
-             'service_graph_name': '',
-             'in_service_graph_name': '',
-             'out_service_graph_name': '',
-             'monitored': False}, **kwargs)
+            self._defaults, **kwargs)
 
 
 class Endpoint(ResourceBase):
@@ -928,10 +1004,12 @@ class L3OutStaticRoute(AciResourceBase):
     _aci_mo_name = 'ipRouteP'
     _tree_parent = L3OutNode
 
+    _defaults = {'next_hop_list': [],
+                 'preference': '1',
+                 'monitored': False}
+
     def __init__(self, **kwargs):
-        super(L3OutStaticRoute, self).__init__(
-            {'next_hop_list': [], 'preference': '1',
-             'monitored': False}, **kwargs)
+        super(L3OutStaticRoute, self).__init__(self._defaults, **kwargs)
 
 
 class L3OutInterfaceProfile(AciResourceBase):
@@ -984,12 +1062,18 @@ class L3OutInterface(AciResourceBase):
     _aci_mo_name = 'l3extRsPathL3OutAtt'
     _tree_parent = L3OutInterfaceProfile
 
+    _defaults = {'primary_addr_a': '',
+                 'secondary_addr_a_list': [],
+                 'primary_addr_b': '',
+                 'secondary_addr_b_list': [],
+                 'encap': '',
+                 'type': 'ext-svi',
+                 'mode': 'regular',
+                 'monitored': False,
+                 'host': ''}
+
     def __init__(self, **kwargs):
-        super(L3OutInterface, self).__init__(
-            {'primary_addr_a': '', 'secondary_addr_a_list': [],
-             'primary_addr_b': '', 'secondary_addr_b_list': [],
-             'encap': '', 'type': 'ext-svi', 'mode': 'regular',
-             'monitored': False, 'host': ''}, **kwargs)
+        super(L3OutInterface, self).__init__(self._defaults, **kwargs)
 
 
 class L3OutInterfaceBgpPeerP(AciResourceBase):
@@ -1046,12 +1130,13 @@ class ExternalNetwork(AciResourceBase):
     _aci_mo_name = 'l3extInstP'
     _tree_parent = L3Outside
 
+    _defaults = {'nat_epg_dn': '',
+                 'provided_contract_names': [],
+                 'consumed_contract_names': [],
+                 'monitored': False}
+
     def __init__(self, **kwargs):
-        super(ExternalNetwork, self).__init__(
-            {'nat_epg_dn': '',
-             'provided_contract_names': [], 'consumed_contract_names': [],
-             'monitored': False},
-            **kwargs)
+        super(ExternalNetwork, self).__init__(self._defaults, **kwargs)
 
 
 class ExternalSubnet(AciResourceBase):
@@ -1153,19 +1238,20 @@ class SecurityGroupRule(AciResourceBase):
     _aci_mo_name = 'hostprotRule'
     _tree_parent = SecurityGroupSubject
 
+    _defaults = {'direction': 'ingress',
+                 'ethertype': "undefined",
+                 'remote_ips': [],
+                 'ip_protocol': t.UNSPECIFIED,
+                 'from_port': t.UNSPECIFIED,
+                 'to_port': t.UNSPECIFIED,
+                 'icmp_type': t.UNSPECIFIED,
+                 'icmp_code': t.UNSPECIFIED,
+                 'conn_track': 'reflexive',
+                 'remote_group_id': '',
+                 'monitored': False}
+
     def __init__(self, **kwargs):
-        super(SecurityGroupRule, self).__init__(
-            {'direction': 'ingress',
-             'ethertype': "undefined",
-             'remote_ips': [],
-             'ip_protocol': self.UNSPECIFIED,
-             'from_port': self.UNSPECIFIED,
-             'to_port': self.UNSPECIFIED,
-             'icmp_type': self.UNSPECIFIED,
-             'icmp_code': self.UNSPECIFIED,
-             'conn_track': 'reflexive',
-             'remote_group_id': '',
-             'monitored': False}, **kwargs)
+        super(SecurityGroupRule, self).__init__(self._defaults, **kwargs)
 
 
 class Configuration(ResourceBase):
@@ -1353,15 +1439,15 @@ class VmmInjectedService(AciResourceBase):
     _aci_mo_name = 'vmmInjectedSvc'
     _tree_parent = VmmInjectedNamespace
 
+    _defaults = {'service_type': 'clusterIp',
+                 'cluster_ip': '0.0.0.0',
+                 'load_balancer_ip': '0.0.0.0',
+                 'service_ports': [],
+                 'endpoints': [],
+                 'guid': ''}
+
     def __init__(self, **kwargs):
-        super(VmmInjectedService, self).__init__(
-            {'service_type': 'clusterIp',
-             'cluster_ip': '0.0.0.0',
-             'load_balancer_ip': '0.0.0.0',
-             'service_ports': [],
-             'endpoints': [],
-             'guid': ''},
-            **kwargs)
+        super(VmmInjectedService, self).__init__(self._defaults, **kwargs)
 
 
 class VmmInjectedHost(AciResourceBase):
@@ -1599,11 +1685,12 @@ class SpanVsource(AciResourceBase):
     _aci_mo_name = 'spanVSrc'
     _tree_parent = SpanVsourceGroup
 
+    _defaults = {'dir': 'both',
+                 'src_paths': [],
+                 'monitored': False}
+
     def __init__(self, **kwargs):
-        super(SpanVsource, self).__init__({'dir': 'both',
-                                           'src_paths': [],
-                                           'monitored': False},
-                                          **kwargs)
+        super(SpanVsource, self).__init__(self._defaults, **kwargs)
 
 
 class SpanVdestGroup(AciResourceBase):
@@ -1700,11 +1787,13 @@ class InfraAccBundleGroup(AciResourceBase):
     _aci_mo_name = 'infraAccBndlGrp'
     _tree_parent = Infra
 
+    _defaults = {'monitored': False,
+                 'lag_t': 'link',
+                 'span_vsource_group_names': [],
+                 'span_vdest_group_names': []}
+
     def __init__(self, **kwargs):
-        super(InfraAccBundleGroup, self).__init__(
-            {'monitored': False, 'lag_t': 'link',
-             'span_vsource_group_names': [], 'span_vdest_group_names': []},
-            **kwargs)
+        super(InfraAccBundleGroup, self).__init__(self._defaults, **kwargs)
 
 
 class InfraAccPortGroup(AciResourceBase):
@@ -1724,10 +1813,12 @@ class InfraAccPortGroup(AciResourceBase):
     _aci_mo_name = 'infraAccPortGrp'
     _tree_parent = Infra
 
+    _defaults = {'monitored': False,
+                 'span_vsource_group_names': [],
+                 'span_vdest_group_names': []}
+
     def __init__(self, **kwargs):
-        super(InfraAccPortGroup, self).__init__(
-            {'monitored': False, 'span_vsource_group_names': [],
-             'span_vdest_group_names': []}, **kwargs)
+        super(InfraAccPortGroup, self).__init__(self._defaults, **kwargs)
 
 
 class SpanSpanlbl(AciResourceBase):
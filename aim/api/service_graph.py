@@ -44,20 +44,20 @@ class DeviceCluster(resource.AciResourceBase):
     _aci_mo_name = 'vnsLDevVip'
     _tree_parent = resource.Tenant
 
+    _defaults = {'display_name': '',
+                 'device_type': 'PHYSICAL',
+                 'service_type': 'OTHERS',
+                 'context_aware': 'single-Context',
+                 'managed': True,
+                 'physical_domain_name': '',
+                 'vmm_domain_type': '',
+                 'vmm_domain_name': '',
+                 'encap': '',
+                 'devices': [],
+                 'monitored': False}
+
     def __init__(self, **kwargs):
-        super(DeviceCluster, self).__init__(
-            {'display_name': '',
-             'device_type': 'PHYSICAL',
-             'service_type': 'OTHERS',
-             'context_aware': 'single-Context',
-             'managed': True,
-             'physical_domain_name': '',
-             'vmm_domain_type': '',
-             'vmm_domain_name': '',
-             'encap': '',
-             'devices': [],
-             'monitored': False},
-            **kwargs)
+        super(DeviceCluster, self).__init__(self._defaults, **kwargs)
 
 
 class DeviceClusterInterface(resource.AciResourceBase):
@@ -78,13 +78,13 @@ class DeviceClusterInterface(resource.AciResourceBase):
     _aci_mo_name = 'vnsLIf'
     _tree_parent = DeviceCluster
 
+    _defaults = {'display_name': '',
+                 'encap': '',
+                 'concrete_interfaces': [],
+                 'monitored': False}
+
     def __init__(self, **kwargs):
-        super(DeviceClusterInterface, self).__init__(
-            {'display_name': '',
-             'encap': '',
-             'concrete_interfaces': [],
-             'monitored': False},
-            **kwargs)
+        super(DeviceClusterInterface, self).__init__(self._defaults, **kwargs)
 
 
 class ConcreteDevice(resource.AciResourceBase):
@@ -158,11 +158,12 @@ class ServiceGraph(resource.AciResourceBase):
     _aci_mo_name = 'vnsAbsGraph'
     _tree_parent = resource.Tenant
 
+    _defaults = {'display_name': '',
+                 'linear_chain_nodes': [],
+                 'monitored': False}
+
     def __init__(self, **kwargs):
-        super(ServiceGraph, self).__init__({'display_name': '',
-                                            'linear_chain_nodes': [],
-                                            'monitored': False},
-                                           **kwargs)
+        super(ServiceGraph, self).__init__(self._defaults, **kwargs)
 
 
 class ServiceGraphConnection(resource.AciResourceBase):
@@ -187,17 +188,17 @@ class ServiceGraphConnection(resource.AciResourceBase):
     _aci_mo_name = 'vnsAbsConnection'
     _tree_parent = ServiceGraph
 
+    _defaults = {'display_name': '',
+                 'adjacency_type': 'L2',
+                 'connector_direction': 'provider',
+                 'connector_type': 'external',
+                 'direct_connect': False,
+                 'unicast_route': False,
+                 'connector_dns': [],
+                 'monitored': False}
+
     def __init__(self, **kwargs):
-        super(ServiceGraphConnection, self).__init__(
-            {'display_name': '',
-             'adjacency_type': 'L2',
-             'connector_direction': 'provider',
-             'connector_type': 'external',
-             'direct_connect': False,
-             'unicast_route': False,
-             'connector_dns': [],
-             'monitored': False},
-            **kwargs)
+        super(ServiceGraphConnection, self).__init__(self._defaults, **kwargs)
 
 
 class ServiceGraphNode(resource.AciResourceBase):
@@ -223,18 +224,18 @@ class ServiceGraphNode(resource.AciResourceBase):
     _aci_mo_name = 'vnsAbsNode'
     _tree_parent = ServiceGraph
 
+    _defaults = {'display_name': '',
+                 'function_type': 'GoTo',
+                 'managed': True,
+                 'routing_mode': 'unspecified',
+                 'connectors': [],
+                 'device_cluster_name': '',
+                 'device_cluster_tenant_name': '',
+                 'sequence_number': '0',
+                 'monitored': False}
+
     def __init__(self, **kwargs):
-        super(ServiceGraphNode, self).__init__(
-            {'display_name': '',
-             'function_type': 'GoTo',
-             'managed': True,
-             'routing_mode': 'unspecified',
-             'connectors': [],
-             'device_cluster_name': '',
-             'device_cluster_tenant_name': '',
-             'sequence_number': '0',
-             'monitored': False},
-            **kwargs)
+        super(ServiceGraphNode, self).__init__(self._defaults, **kwargs)
 
 
 class ServiceRedirectMonitoringPolicy(resource.AciResourceBase):
@@ -302,14 +303,14 @@ class ServiceRedirectPolicy(resource.AciResourceBase):
     _aci_mo_name = 'vnsSvcRedirectPol'
     _tree_parent = resource.Tenant
 
+    _defaults = {'display_name': '',
+                 'monitoring_policy_tenant_name': '',
+                 'monitoring_policy_name': '',
+                 'destinations': [],
+                 'monitored': False}
+
     def __init__(self, **kwargs):
-        super(ServiceRedirectPolicy, self).__init__(
-            {'display_name': '',
-             'monitoring_policy_tenant_name': '',
-             'monitoring_policy_name': '',
-             'destinations': [],
-             'monitored': False},
-            **kwargs)
+        super(ServiceRedirectPolicy, self).__init__(self._defaults, **kwargs)
 
 
 class DeviceClusterContext(resource.AciResourceBase):
@@ -65,13 +65,15 @@ class AciStatus(resource.ResourceBase, OperationalResource):
     HEALTH_GOOD = "Good Health Score"
     HEALTH_EXCELLENT = "Excellent Health Score"
 
+    _defaults = {'resource_type': None,
+                 'resource_id': None,
+                 'sync_status': SYNC_NA,
+                 'sync_message': '',
+                 'health_score': 100,
+                 'faults': []}
+
     def __init__(self, **kwargs):
-        super(AciStatus, self).__init__({'resource_type': None,
-                                         'resource_id': None,
-                                         'sync_status': self.SYNC_NA,
-                                         'sync_message': '',
-                                         'health_score': 100,
-                                         'faults': []}, **kwargs)
+        super(AciStatus, self).__init__(self._defaults, **kwargs)
         self._parent_class = None
 
     @property
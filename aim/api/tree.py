@@ -78,5 +78,8 @@ class ActionLog(api_res.ResourceBase):
     )
 
     def __init__(self, **kwargs):
-        super(ActionLog, self).__init__({'uuid': utils.generate_uuid()},
-                                        **kwargs)
+        # Logs read back from the DB already carry their uuid
+        defaults = {}
+        if kwargs.get('uuid') is None:
+            defaults['uuid'] = utils.generate_uuid()
+        super(ActionLog, self).__init__(defaults, **kwargs)
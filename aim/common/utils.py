@@ -161,9 +161,18 @@ def stob(s):
     return None
 
 
+# Only ever called with a small, fixed set of class names
+_snake_names = {}
+
+
 def camel_to_snake(name):
-    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
-    return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+    try:
+        return _snake_names[name]
+    except KeyError:
+        s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
+        snake = re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+        _snake_names[name] = snake
+        return snake
 
 
 def snake_to_lower_camel(name):
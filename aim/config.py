@@ -247,7 +247,7 @@ class ConfigManager(object):
         # If not restricted by host, all the config will be deleted
         configs = self._to_query_format(cfg_obj, host=host)
         LOG.info("Replacing existing configuration for host %s "
-                 "with: %s" % (host, configs))
+                 "with: %s", host, configs)
         self.db.replace_all(context or self.context, configs, host=host)
 
     def override(self, item, value, group='default', host=None, context=None):
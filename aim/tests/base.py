@@ -16,11 +16,15 @@
 import logging  # noqa
 import mock
 import os
+import re
+import threading
+import uuid
 
 from oslo_config import cfg
 from oslo_log import log as o_log
 from oslo_utils import uuidutils
 from oslotest import base
+from sqlalchemy import event as sa_event
 from sqlalchemy.orm import sessionmaker as sa_sessionmaker
 
 from aim.agent.aid.universes.aci import aci_universe
@@ -53,16 +57,26 @@ def etcdir(*p):
     return os.path.join(ETCDIR, *p)
 
 
+# ResourceBase.__eq__ as the API defines it, TestAimDBBase.setUp replaces
+# it with resource_equal.
+resource_base_eq = resource.ResourceBase.__eq__
+
+
 def resource_equal(self, other):
 
     if type(self) != type(other):
         return False
-    for attr in self.identity_attributes:
-        if getattr(self, attr) != getattr(other, attr):
-            return False
-    for attr in self.other_attributes:
-        if (utils.deep_sort(getattr(self, attr, None)) !=
-                utils.deep_sort(getattr(other, attr, None))):
+    # Most mismatches differ in identity, compare it first in one go
+    if self._identity_getter(self) != other._identity_getter(other):
+        return False
+    for attr in self._other_names:
+        mine = getattr(self, attr, None)
+        theirs = getattr(other, attr, None)
+        # Only fall back to the order insensitive comparison, which copies
+        # and sorts nested values, when a plain comparison fails
+        if mine is theirs or mine == theirs:
+            continue
+        if utils.deep_sort(mine) != utils.deep_sort(theirs):
             return False
     return True
 
@@ -86,9 +100,7 @@ class BaseTestCase(base.BaseTestCase):
     def config_parse(self, conf=None, args=None):
         """Create the default configurations."""
         # neutron.conf.test includes rpc_backend which needs to be cleaned up
-        if args is None:
-            args = []
-        args += ['--config-file', self.test_conf_file]
+        args = (args or []) + ['--config-file', self.test_conf_file]
         if conf is None:
             CONF(args=args, project='aim')
         else:
@@ -103,20 +115,60 @@ class BaseTestCase(base.BaseTestCase):
 
     def _check_call_list(self, expected, mocked, check_all=True):
         observed = mocked.call_args_list
+        # Calls aren't hashable and may hold mock.ANY, so they can only be
+        # matched by equality. Look each one up once, and only format the
+        # failure message when a call is actually missing.
         for call in expected:
-            self.assertTrue(call in observed,
-                            msg='Call not found, expected:\n%s\nobserved:'
-                                '\n%s' % (str(call), str(observed)))
-            observed.remove(call)
+            try:
+                observed.remove(call)
+            except ValueError:
+                self.fail('Call not found, expected:\n%s\nobserved:'
+                          '\n%s' % (str(call), str(observed)))
         if check_all:
             self.assertFalse(
                 len(observed),
                 msg='There are more calls than expected: %s' % str(observed))
 
 
-name_to_res = {utils.camel_to_snake(x.__name__): x for x in
-               aim_manager.AimManager.aim_resources}
 k8s_watcher_instance = None
+_ENGINE = None
+_HT_LISTENER = None
+# Names of the tables written since the last cleanup
+_DIRTY_TABLES = set()
+# Table cleanup runs the very same DELETE statements after every test,
+# keep them, in reverse dependency order, and their compiled form around.
+_CLEANUP_DELETES = ()
+_COMPILED_DELETES = {}
+_INSERT_INTO = re.compile(r'\s*INSERT\s+(?:OR\s+\w+\s+)?INTO\s+[`"]?(\w+)',
+                          re.IGNORECASE)
+
+
+_UUID_POOL = []
+_UUID_POOL_LOCK = threading.Lock()
+
+
+def _pooled_uuid():
+    # A single urandom read provides random bytes for a whole batch of
+    # identifiers.
+    with _UUID_POOL_LOCK:
+        if not _UUID_POOL:
+            raw = os.urandom(16 * 256)
+            _UUID_POOL.extend(
+                str(uuid.UUID(bytes=raw[i:i + 16], version=4))
+                for i in range(0, len(raw), 16))
+        return _UUID_POOL.pop()
+
+
+# Nothing asserts on these calls, so plain functions stand in for the
+# much heavier Mock objects on every k8s create and delete.
+def _noop(*args, **kwargs):
+    pass
+
+
+def _stream_stub(events):
+    def stream(*args, **kwargs):
+        return events
+    return stream
 
 
 def _k8s_post_create(self, created):
@@ -124,8 +176,8 @@ def _k8s_post_create(self, created):
         w = k8s_watcher_instance
         w.klient.get_new_watch()
         event = {'type': 'ADDED', 'object': created}
-        w.klient.watch.stream = mock.Mock(return_value=[event])
-        w._reset_trees = mock.Mock()
+        w.klient.watch.stream = _stream_stub([event])
+        w._reset_trees = _noop
         w.q.put(event)
         w._persistence_loop(save_on_empty=True, warmup_wait=0)
 
@@ -135,8 +187,8 @@ def _k8s_post_delete(self, deleted):
         w = k8s_watcher_instance
         event = {'type': 'DELETED', 'object': deleted}
         w.klient.get_new_watch()
-        w.klient.watch.stream = mock.Mock(return_value=[event])
-        w._reset_trees = mock.Mock()
+        w.klient.watch.stream = _stream_stub([event])
+        w._reset_trees = _noop
         w.q.put(event)
         w._persistence_loop(save_on_empty=True, warmup_wait=0)
 
@@ -147,19 +199,47 @@ def _initialize_hooks(self):
                                                   self._catch_up_logs)
 
 
+def _track_inserts(conn, cursor, statement, parameters, context,
+                   executemany):
+    match = _INSERT_INTO.match(statement)
+    if match:
+        _DIRTY_TABLES.add(match.group(1))
+
+
+def _get_engine():
+    # The in-memory test database lives as long as the process, so the
+    # engine is fetched and the schema created only once per test run.
+    global _ENGINE, _CLEANUP_DELETES
+    if _ENGINE is None:
+        engine = api.get_engine()
+        model_base.Base.metadata.create_all(engine)
+        _CLEANUP_DELETES = tuple(
+            (table.name, table.delete())
+            for table in reversed(model_base.Base.metadata.sorted_tables))
+        sa_event.listen(engine, 'before_cursor_execute', _track_inserts)
+        _ENGINE = engine
+    return _ENGINE
+
+
+def _get_ht_listener():
+    # The listener keeps no per-store state, one instance can catch up
+    # the action log for every transaction of every test.
+    global _HT_LISTENER
+    if _HT_LISTENER is None:
+        _HT_LISTENER = ht_db_l.HashTreeDbListener(aim_manager.AimManager())
+    return _HT_LISTENER
+
+
 def _catch_up_logs(self, added, updated, removed):
     # Create new session and populate the hashtrees
     session = api.get_session(autocommit=True, expire_on_commit=True,
                               use_slave=False)
     store = aim_store.SqlAlchemyStore(session)
-    ht_db_l.HashTreeDbListener(
-        aim_manager.AimManager()).catch_up_with_action_log(store)
+    _get_ht_listener().catch_up_with_action_log(store)
 
 
 class TestAimDBBase(BaseTestCase):
 
-    _TABLES_ESTABLISHED = False
-
     def setUp(self, mock_store=True):
         super(TestAimDBBase, self).setUp()
         self.test_id = uuidutils.generate_uuid()
@@ -167,21 +247,25 @@ class TestAimDBBase(BaseTestCase):
         aci_universe.ws_context = None
         if not os.environ.get(K8S_STORE_VENV):
             CONF.set_override('aim_store', 'sql', 'aim')
-            self.engine = api.get_engine()
-            if not TestAimDBBase._TABLES_ESTABLISHED:
-                model_base.Base.metadata.create_all(self.engine)
-                TestAimDBBase._TABLES_ESTABLISHED = True
+            self.engine = _get_engine()
 
             # Uncomment the line below to log SQL statements. Additionally, to
             # log results of queries, change INFO to DEBUG
             #
             # logging.getLogger('sqlalchemy.engine').setLevel(logging.DEBUG)
 
+            # Only tables that got rows inserted need to be emptied, which
+            # is usually a handful out of the whole schema.
             def clear_tables():
+                if not _DIRTY_TABLES:
+                    return
                 with self.engine.begin() as conn:
-                    for table in reversed(
-                            model_base.Base.metadata.sorted_tables):
-                        conn.execute(table.delete())
+                    conn = conn.execution_options(
+                        compiled_cache=_COMPILED_DELETES)
+                    for name, delete in _CLEANUP_DELETES:
+                        if name in _DIRTY_TABLES:
+                            conn.execute(delete)
+                _DIRTY_TABLES.clear()
             self.addCleanup(clear_tables)
             if mock_store:
                 self.old_initialize_hooks = (
@@ -220,7 +304,9 @@ class TestAimDBBase(BaseTestCase):
         self.ctx = context.AimContext(store=self.store)
         self.cfg_manager = aim_cfg.ConfigManager(self.ctx, '')
         self.tt_mgr = tree_manager.HashTreeManager()
-        resource.ResourceBase.__eq__ = resource_equal
+        # Patch once, reassigning a class attribute flushes the type caches
+        if resource.ResourceBase.__dict__.get('__eq__') is not resource_equal:
+            resource.ResourceBase.__eq__ = resource_equal
         self.cfg_manager.replace_all(CONF)
         self.sys_id = self.cfg_manager.get_option('aim_system_id', 'aim')
 
@@ -599,7 +685,7 @@ class TestAimDBBase(BaseTestCase):
         Identity attributes will be considered as strings, which could be
         schema-invalid. kwargs can be passed to fix that.
         """
-        res_dict = {x: utils.generate_uuid()
+        res_dict = {x: _pooled_uuid()
                     for x in aim_type.identity_attributes.keys()}
         res_dict.update(kwargs)
         return aim_type(**res_dict)
@@ -21,6 +21,7 @@ Tests for `aim_manager` module.
 """
 
 import copy
+import datetime
 import time
 
 import jsonschema
@@ -180,6 +181,94 @@ class TestAimManager(base.TestAimDBBase):
         self.assertEqual(expected_statuses, statuses)
 
 
+class TestResourceBase(base.BaseTestCase):
+
+    def _eq(self, first, second):
+        # TestAimDBBase replaces ResourceBase.__eq__, call the original one
+        return base.resource_base_eq(first, second)
+
+    def test_equal(self):
+        bd1 = resource.BridgeDomain(tenant_name='t1', name='bd1',
+                                    l3out_names=['l1', 'l2'])
+        bd2 = resource.BridgeDomain(tenant_name='t1', name='bd1',
+                                    l3out_names=['l1', 'l2'])
+        self.assertTrue(self._eq(bd1, bd2))
+        self.assertTrue(self._eq(bd1, bd1))
+
+    def test_not_equal(self):
+        bd1 = resource.BridgeDomain(tenant_name='t1', name='bd1')
+        self.assertFalse(self._eq(
+            bd1, resource.BridgeDomain(tenant_name='t1', name='bd2')))
+        self.assertFalse(self._eq(
+            bd1, resource.BridgeDomain(tenant_name='t1', name='bd1',
+                                       l3out_names=['l1'])))
+        # A member set on one side only
+        bd2 = resource.BridgeDomain(tenant_name='t1', name='bd1',
+                                    _set_default=False)
+        self.assertFalse(self._eq(bd1, bd2))
+        # Any instance attribute takes part in the comparison
+        bd2 = resource.BridgeDomain(tenant_name='t1', name='bd1')
+        bd2._aim_id = 'id1'
+        self.assertFalse(self._eq(bd1, bd2))
+
+    def test_different_type(self):
+        # Same attribute values, different resource types
+        ap = resource.ApplicationProfile(tenant_name='t1', name='n1')
+        flt = resource.Filter(tenant_name='t1', name='n1')
+        self.assertEqual(ap.__dict__, flt.__dict__)
+        self.assertFalse(self._eq(ap, flt))
+        self.assertFalse(self._eq(ap, None))
+
+    def test_hash(self):
+        bd1 = resource.BridgeDomain(tenant_name='t1', name='bd1')
+        bd2 = resource.BridgeDomain(tenant_name='t1', name='bd1')
+        self.assertEqual(hash(bd1), hash(bd2))
+        self.assertEqual(1, len(set([bd1, bd2])))
+        # Agents compare by id only
+        agent1 = resource.Agent(id='a1', agent_type='aid', host='h1',
+                                binary_file='f1', hash_trees=['tree1'],
+                                version='1.0')
+        agent2 = resource.Agent(id='a1', agent_type='aid', host='h2',
+                                binary_file='f2', hash_trees=['tree2'],
+                                version='2.0')
+        self.assertEqual(agent1, agent2)
+        self.assertEqual(hash(agent1), hash(agent2))
+        self.assertEqual(1, len(set([agent1, agent2])))
+        # Faults compare by identity only
+        fault1 = aim_status.AciFault(
+            fault_code='F0001', external_identifier='uni/tn-t1/fault-F0001',
+            severity='critical', description='fault 1')
+        fault2 = aim_status.AciFault(
+            fault_code='F0001', external_identifier='uni/tn-t1/fault-F0001',
+            severity='warning', cause='cause', description='fault 2')
+        self.assertEqual(fault1, fault2)
+        self.assertEqual(hash(fault1), hash(fault2))
+        self.assertEqual(1, len(set([fault1, fault2])))
+
+    def test_class_defaults_not_aliased(self):
+        for klass in aim_manager.AimManager.aim_resources:
+            identity = dict((k, 'x') for k in klass.identity_attributes)
+            res = klass(**identity)
+            lists = [k for k, v in res.__dict__.items()
+                     if isinstance(v, list)]
+            for attr in lists:
+                getattr(res, attr).append('x')
+            if 'display_name' in klass.other_attributes:
+                res.display_name = 'x'
+            fresh = klass(**identity)
+            for attr in lists:
+                self.assertEqual([], getattr(fresh, attr),
+                                 '%s.%s' % (klass.__name__, attr))
+            if 'display_name' in klass.other_attributes:
+                self.assertEqual('', fresh.display_name, klass.__name__)
+
+        # Lists given by the caller are used as they are
+        filters = ['f1']
+        subj = resource.ContractSubject(tenant_name='t1', contract_name='c1',
+                                        name='s1', in_filters=filters)
+        self.assertIs(filters, subj.in_filters)
+
+
 class TestResourceOpsBase(object):
     test_dn = None
     prereq_objects = None
@@ -2415,6 +2504,23 @@ class TestAgent(TestAgentMixin, TestResourceOpsBase, base.TestAimDBBase):
             self.set_override('agent_down_time', 0, 'aim')
             self.assertTrue(agent.is_down(self.ctx))
 
+    def test_agent_down_given_timestamp(self):
+        agent = resource.Agent(agent_type='aid', host='host',
+                               binary_file='binary_file', version='1.0')
+        agent.heartbeat_timestamp = datetime.datetime(2020, 1, 1)
+        self.set_override('agent_down_time', 60, 'aim')
+        alive = agent.heartbeat_timestamp + datetime.timedelta(seconds=30)
+        down = agent.heartbeat_timestamp + datetime.timedelta(seconds=90)
+        # A timestamp given by the caller replaces the store lookup
+        with mock.patch.object(type(self.ctx.store), 'current_timestamp',
+                               new_callable=mock.PropertyMock,
+                               side_effect=AssertionError) as current:
+            self.assertFalse(agent.is_down(self.ctx, current=alive))
+            self.assertIsNone(agent.down_time(self.ctx, current=alive))
+            self.assertTrue(agent.is_down(self.ctx, current=down))
+            self.assertEqual(90, agent.down_time(self.ctx, current=down))
+            self.assertFalse(current.called)
+
     def test_status(self):
         pass
 